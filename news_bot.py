@@ -4,15 +4,27 @@
 Любой пользователь может подписаться через /start
 """
 import json
-import urllib.request
+import html
+import string
+import math
+import hashlib
+import sqlite3
+import http.client
 import urllib.parse
-import urllib.error
 from datetime import datetime, timedelta
 import time
 import logging
+import logging.handlers
+import queue
+import atexit
 import sys
 import os
+import signal
 import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 # ==================== КОНФИГУРАЦИЯ ====================
@@ -21,6 +33,8 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 CHECK_INTERVAL_MINUTES = int(os.getenv("CHECK_INTERVAL_MINUTES"))
 CHECK_HOURS = int(os.getenv("CHECK_HOURS"))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Сколько запросов к GNews выполняется одновременно
+GNEWS_MAX_WORKERS = int(os.getenv("GNEWS_MAX_WORKERS", "10"))
 
 # Определяем директорию для хранения данных
 # На Render с диском используем /data, локально - текущую директорию
@@ -29,237 +43,967 @@ if not os.path.exists(DATA_DIR):
     os.makedirs(DATA_DIR)
 
 SUBSCRIBERS_FILE = os.path.join(DATA_DIR, "subscribers.json")
+SUBSCRIBERS_LOG_FILE = os.path.join(DATA_DIR, "subscribers.log")
+SENT_NEWS_DB = os.path.join(DATA_DIR, "sent_news.sqlite")
+# Прежний формат истории: при первом запуске переносится в SENT_NEWS_DB
 SENT_NEWS_FILE = os.path.join(DATA_DIR, "sent_news.json")
 BOT_STATE_FILE = os.path.join(DATA_DIR, "bot_state.json")
+TRANSLATE_CACHE_FILE = os.path.join(DATA_DIR, "translate_cache.sqlite")
 
 
 # ==================== НАСТРОЙКА ЛОГИРОВАНИЯ ====================
+# Рабочие потоки только кладут записи в очередь, а вывод в консоль и
+# запись в файл выполняет фоновый поток (запускается в main)
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(
+    log_queue,
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler('news_bot.log', encoding='utf-8')
+)
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('news_bot.log', encoding='utf-8')
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 
+# ==================== ВСПОМОГАТЕЛЬНЫЕ ФУНКЦИИ ====================
+@lru_cache(maxsize=4096)
+def format_date(published_at: str) -> str:
+    """
+    Преобразовать дату публикации в формат ДД.ММ.ГГГГ ЧЧ:ММ
+    Результат кэшируется: одна и та же дата часто приходит в нескольких статьях
+    """
+    if published_at:
+        try:
+            dt = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+            return dt.strftime("%d.%m.%Y %H:%M")
+        except ValueError:
+            pass
+    return published_at
+
+
+def url_fingerprint(url: str) -> int:
+    """
+    64-битный отпечаток URL - компактнее самой строки в множествах
+    Встроенный hash() строки считается без кодирования в байты; его значение меняется
+    между запусками, поэтому отпечатки живут только в памяти и на диск не пишутся
+    """
+    return hash(url)
+
+
+def read_json(filename: str):
+    """Прочитать JSON-файл целиком и разобрать байты за один вызов json.loads"""
+    with open(filename, 'rb') as f:
+        return json.loads(f.read())
+
+
+def write_json_atomic(filename: str, data, **kwargs):
+    """Записать JSON во временный файл и атомарно заменить им исходный"""
+    # json.dumps собирает строку в C-энкодере, тогда как json.dump пишет в файл по кусочкам
+    payload = json.dumps(data, **kwargs).encode('utf-8')
+    tmp_filename = filename + ".tmp"
+    with open(tmp_filename, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_filename, filename)
+
+
+class DebouncedSaver:
+    """
+    Отложенное сохранение на диск
+    Изменения только помечают данные как измененные, а сама запись выполняется
+    фоновым таймером не чаще раза в interval секунд, при flush() и при выходе
+    """
+
+    def __init__(self, save_func, interval: float = 5.0):
+        self._save_func = save_func
+        self.interval = interval
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def mark_dirty(self):
+        """Отметить, что данные изменились, и запланировать запись"""
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Немедленно записать изменения, если они есть"""
+        with self._save_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+            self._save_func()
+
+
+# ==================== HTTP-КЛИЕНТ ====================
+class HttpError(Exception):
+    """Ответ сервера с кодом ошибки (4xx/5xx)"""
+
+    def __init__(self, status: int, reason: str, body: bytes = b""):
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.status = status
+        self.body = body
+
+
+class HttpClient:
+    """
+    HTTP-клиент с общим пулом постоянных (keep-alive) соединений
+    Соединение берется из пула на время запроса и возвращается обратно,
+    поэтому TCP+TLS рукопожатие с хостом выполняется один раз за время
+    работы процесса, а не на каждый запрос или рабочий поток
+    """
+
+    # Коды ответа, после которых запрос стоит повторить
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    # Сколько секунд соединение может простаивать в пуле: дольше его могли
+    # молча закрыть сервер или NAT, и первый же запрос по нему завис бы или упал
+    IDLE_TIMEOUT = 30.0
+
+    # maxsize - сколько свободных соединений держать на каждый хост: с запасом
+    # покрывает одновременные запросы рабочих потоков (рассылка + long polling и т.п.)
+    def __init__(self, maxsize: int = 20, retries: int = 3, backoff_factor: float = 0.3):
+        self.maxsize = maxsize
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._idle = {}  # хост -> [(соединение, когда возвращено в пул), ...]
+        self._lock = threading.Lock()
+
+    def _retry_delay(self, attempt: int, retry_after: str = None) -> float:
+        """Пауза перед повтором: Retry-After от сервера или экспоненциальная задержка"""
+        if retry_after:
+            try:
+                return min(float(retry_after), 60.0)
+            except ValueError:
+                pass
+        return self.backoff_factor * (2 ** (attempt - 1))
+
+    def _acquire(self, host: str, timeout: float, fresh: bool = False):
+        """
+        Взять свободное соединение из пула или открыть новое; вернуть (соединение, из пула ли)
+        Соединения, простоявшие дольше IDLE_TIMEOUT, закрываются; fresh=True - всегда новое
+        """
+        conn = None
+        stale = []
+        with self._lock:
+            idle = self._idle.get(host)
+            if idle:
+                deadline = time.monotonic() - self.IDLE_TIMEOUT
+                # Свежие соединения лежат в конце списка, устаревшие - в начале
+                while idle and idle[0][1] < deadline:
+                    stale.append(idle.pop(0)[0])
+                if idle and not fresh:
+                    conn = idle.pop()[0]
+        for old in stale:
+            old.close()
+        if conn is None:
+            return http.client.HTTPSConnection(host, timeout=timeout), False
+        conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _release(self, host: str, conn: http.client.HTTPSConnection):
+        """Вернуть соединение в пул (или закрыть, если пул заполнен)"""
+        with self._lock:
+            idle = self._idle.setdefault(host, [])
+            if len(idle) < self.maxsize:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def request(self, method: str, url: str, body: bytes = None, headers: dict = None, timeout: float = 10,
+                limiter: "RateLimiter" = None) -> bytes:
+        """
+        Выполнить запрос и вернуть тело ответа
+        limiter - ограничитель частоты для этого API: при ответе 429 он штрафуется на
+        время Retry-After, и паузу выдерживают все потоки, а не только повторяющий запрос
+        """
+        parts = urllib.parse.urlsplit(url)
+        host = parts.netloc
+        path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        headers = dict(headers or {})
+        headers.setdefault("Connection", "keep-alive")
+
+        attempt = 0
+        # После сбоя соединения из пула повтор идет по новому: соседние в пуле
+        # простаивали столько же и, скорее всего, тоже оборваны
+        fresh = False
+        while True:
+            conn, reused = self._acquire(host, timeout, fresh)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (ConnectionError, http.client.BadStatusLine):
+                conn.close()
+                # Сервер закрыл простаивающее соединение - переподключаемся
+                if reused:
+                    fresh = True
+                    continue
+                # Обрыв нового соединения повторяем только для GET:
+                # POST мог уже дойти до сервера
+                if method != "GET" or attempt >= self.retries:
+                    raise
+                attempt += 1
+                time.sleep(self._retry_delay(attempt))
+                continue
+            except OSError:
+                conn.close()
+                # Оборванное соединение из пула может дать и тайм-аут, и ошибку TLS
+                # (ssl.SSLEOFError); GET безопасно повторить по новому соединению
+                if reused and method == "GET":
+                    fresh = True
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+            if response.will_close or conn.sock is None:
+                conn.close()
+            else:
+                self._release(host, conn)
+
+            # 429 означает, что запрос не обработан, его можно повторить
+            # для любого метода; ошибки 5xx - только для GET
+            retryable = response.status == 429 or (method == "GET" and response.status in self.RETRY_STATUSES)
+            if retryable and attempt < self.retries:
+                attempt += 1
+                delay = self._retry_delay(attempt, response.getheader("Retry-After"))
+                if limiter is not None and response.status == 429:
+                    limiter.penalize(delay)
+                time.sleep(delay)
+                continue
+            if response.status >= 400:
+                raise HttpError(response.status, response.reason, data)
+            return data
+
+
+# Один клиент на весь процесс: его пул используют все классы и потоки
+http_client = HttpClient()
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов (token bucket)
+    Пока лимит не исчерпан, запросы проходят без задержки,
+    иначе поток ждет ровно столько, сколько нужно до следующего токена
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int):
+        self.rate = rate_per_sec
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Получить токен (при необходимости подождать)"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self, seconds: float):
+        """Сервер ответил 429: следующие запросы пройдут не раньше чем через seconds секунд"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Долг в токенах: acquire будет ждать, пока он не погасится
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
 # ==================== УПРАВЛЕНИЕ ПОДПИСЧИКАМИ ====================
 class SubscriberManager:
-    """Управление подписчиками бота"""
+    """
+    Управление подписчиками бота
+    На диске: снимок subscribers.json и журнал изменений subscribers.log ("+id"/"-id"
+    по строке). Подписка и отписка только дописывают строку в журнал, а снимок
+    перезаписывается (и журнал очищается) отложенно - не чаще раза в COMPACT_INTERVAL секунд
+    """
 
-    def __init__(self, filename: str = SUBSCRIBERS_FILE):
+    COMPACT_INTERVAL = 60.0
+
+    def __init__(self, filename: str = SUBSCRIBERS_FILE, log_filename: str = SUBSCRIBERS_LOG_FILE):
         self.filename = filename
+        self.log_filename = log_filename
+        # Набор меняет поток команд, а читают рассылка и сохранение - все под одной блокировкой
+        self._lock = threading.RLock()
         self.subscribers = self.load_subscribers()
+        # Неизменяемый снимок подписчиков (frozenset: проверка "in" за O(1));
+        # сбрасывается при изменении набора
+        self._snapshot = None
+        self._log = open(self.log_filename, 'ab', buffering=0)
+        self._saver = DebouncedSaver(self.save_subscribers, interval=self.COMPACT_INTERVAL)
 
     def load_subscribers(self) -> set:
-        """Загрузить список подписчиков из файла"""
+        """Загрузить список подписчиков: снимок из файла + изменения из журнала"""
+        subscribers = set()
         try:
             if os.path.exists(self.filename):
-                with open(self.filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    subscribers = set(data.get('subscribers', []))
-                    logger.info(f"Загружено {len(subscribers)} подписчиков")
-                    return subscribers
+                data = read_json(self.filename)
+                subscribers = set(data.get('subscribers', []))
+        except Exception as e:
+            logger.error("Ошибка при загрузке подписчиков: %s", e)
+
+        try:
+            if os.path.exists(self.log_filename):
+                self._replay_log(subscribers)
         except Exception as e:
-            logger.error(f"Ошибка при загрузке подписчиков: {str(e)}")
-        return set()
+            logger.error("Ошибка при загрузке журнала подписчиков: %s", e)
+
+        logger.info("Загружено %d подписчиков", len(subscribers))
+        return subscribers
+
+    def _replay_log(self, subscribers: set):
+        """Применить к набору подписчиков изменения из журнала"""
+        with open(self.log_filename, 'rb') as f:
+            data = f.read()
+        lines = data.split(b'\n')
+        # После последнего перевода строки остается либо пустая строка, либо
+        # недописанная запись (процесс упал во время записи) - ее не применяем
+        torn = lines.pop()
+        for line in lines:
+            try:
+                record = line.decode('utf-8')
+            except UnicodeDecodeError:
+                record = ''
+            op, chat_id = record[:1], record[1:]
+            if op not in ('+', '-') or not chat_id:
+                logger.warning("Пропущена поврежденная запись журнала подписчиков: %r", line)
+            elif op == '+':
+                subscribers.add(chat_id)
+            else:
+                subscribers.discard(chat_id)
+        if torn:
+            logger.warning("Отброшена недописанная запись журнала подписчиков: %r", torn)
+            # Обрезаем ее, чтобы следующая запись не склеилась с обрывком
+            os.truncate(self.log_filename, len(data) - len(torn))
 
     def save_subscribers(self):
-        """Сохранить список подписчиков в файл"""
+        """Сохранить снимок подписчиков в файл и очистить журнал изменений"""
         try:
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump({'subscribers': list(self.subscribers)}, f, ensure_ascii=False, indent=2)
-            logger.info(f"Сохранено {len(self.subscribers)} подписчиков")
+            with self._lock:
+                subscribers = list(self.subscribers)
+                offset = os.fstat(self._log.fileno()).st_size
+            # Запись на диск - без блокировки, подписка в это время не ждет.
+            # Файл читает только бот, поэтому пишем компактно, без отступов
+            write_json_atomic(self.filename, {'subscribers': subscribers}, separators=(',', ':'))
+            with self._lock:
+                # Изменения до offset уже вошли в снимок; дописанное после - переносим
+                # в новый журнал. Он тоже пишется во временный файл и подменяет старый
+                # атомарно: при сбое до подмены остается полный старый журнал, а его
+                # повторное применение к новому снимку дает тот же набор подписчиков
+                tail = b''
+                if os.fstat(self._log.fileno()).st_size > offset:
+                    with open(self.log_filename, 'rb') as f:
+                        f.seek(offset)
+                        tail = f.read()
+                tmp_filename = self.log_filename + ".tmp"
+                with open(tmp_filename, 'wb') as f:
+                    f.write(tail)
+                os.replace(tmp_filename, self.log_filename)
+                self._log.close()
+                self._log = open(self.log_filename, 'ab', buffering=0)
+            logger.info("Сохранено %d подписчиков", len(subscribers))
         except Exception as e:
-            logger.error(f"Ошибка при сохранении подписчиков: {str(e)}")
+            logger.error("Ошибка при сохранении подписчиков: %s", e)
+
+    def _append_log(self, record: str):
+        """Дописать изменение в журнал (вызывается под self._lock)"""
+        try:
+            self._log.write(f"{record}\n".encode('utf-8'))
+        except Exception as e:
+            logger.error("Ошибка записи в журнал подписчиков: %s", e)
 
     def add_subscriber(self, chat_id: str) -> bool:
         """Добавить подписчика"""
-        if chat_id not in self.subscribers:
+        with self._lock:
+            if chat_id in self.subscribers:
+                return False
             self.subscribers.add(chat_id)
-            self.save_subscribers()
-            logger.info(f"Новый подписчик: {chat_id}")
-            return True
-        return False
+            self._snapshot = None
+            self._append_log(f"+{chat_id}")
+        self._saver.mark_dirty()
+        logger.info("Новый подписчик: %s", chat_id)
+        return True
 
     def remove_subscriber(self, chat_id: str) -> bool:
         """Удалить подписчика"""
-        if chat_id in self.subscribers:
+        with self._lock:
+            if chat_id not in self.subscribers:
+                return False
             self.subscribers.remove(chat_id)
-            self.save_subscribers()
-            logger.info(f"Подписчик удален: {chat_id}")
-            return True
-        return False
-
-    def get_subscribers(self) -> list:
-        """Получить список всех подписчиков"""
-        return list(self.subscribers)
+            self._snapshot = None
+            self._append_log(f"-{chat_id}")
+        self._saver.mark_dirty()
+        logger.info("Подписчик удален: %s", chat_id)
+        return True
+
+    def get_subscribers(self) -> frozenset:
+        """Получить всех подписчиков (снимок пересобирается только после изменений)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._snapshot = frozenset(self.subscribers)
+        return snapshot
+
+    def is_subscribed(self, chat_id: str) -> bool:
+        """Проверить, подписан ли чат (без построения снимка)"""
+        with self._lock:
+            return chat_id in self.subscribers
+
+    def flush(self):
+        """Записать несохраненные изменения на диск"""
+        self._saver.flush()
 
 
 # ==================== КЛАСС ДЛЯ ПЕРЕВОДА ====================
 class Translator:
     """Класс для перевода текстов на украинский язык"""
 
-    def __init__(self):
+    # Ограничение одновременных запросов, чтобы не упереться в лимиты Google
+    MAX_WORKERS = 10
+    # Сколько строк отправлять в Google Translate одним запросом
+    BATCH_SIZE = 20
+    # Максимальная длина закодированного текста в одном запросе (лимит длины URL)
+    MAX_QUERY_LENGTH = 7500
+    _http = http_client
+
+    # Сколько переводов держать в памяти
+    MEMORY_CACHE_SIZE = 10000
+    # Сколько дней хранить переводы в кэше на диске
+    CACHE_TTL_DAYS = 30
+
+    def __init__(self, cache_file: str = TRANSLATE_CACHE_FILE):
         self.target_lang = "uk"
+        # Постоянная часть URL перевода; при запросе дописываются только язык и текст
+        self._translate_prefix = (
+            f"https://translate.googleapis.com/translate_a/single?client=gtx&tl={self.target_lang}&dt=t&sl="
+        )
+        # Двухуровневый кэш переводов: в памяти (LRU) + SQLite на диске.
+        # В памяти: ключ -> (перевод, время записи), срок жизни тот же, что на диске
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(cache_file, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # В режиме WAL синхронизация при каждой фиксации не нужна: при сбое питания
+        # теряются лишь последние переводы, а кэш можно заполнить заново
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS tr(k TEXT PRIMARY KEY, v TEXT, created_at REAL)")
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(tr)")]
+        if "created_at" not in columns:
+            # Кэш старого формата без времени записи
+            self._db.execute("ALTER TABLE tr ADD COLUMN created_at REAL")
+            self._db.execute("UPDATE tr SET created_at=?", (time.time(),))
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_tr_created_at ON tr(created_at)")
+        self.cleanup_cache()
+        self.warm_cache()
+
+    def cleanup_cache(self):
+        """Удалить из кэша (на диске и в памяти) переводы старше CACHE_TTL_DAYS дней"""
+        try:
+            cutoff = self._cache_cutoff()
+            # Соединение общее с потоками перевода - доступ к нему только под блокировкой
+            with self._lock:
+                for key in [key for key, (_, created_at) in self._mem.items() if created_at < cutoff]:
+                    del self._mem[key]
+                removed = self._db.execute("DELETE FROM tr WHERE created_at < ?", (cutoff,)).rowcount
+            if removed > 0:
+                logger.info("Удалено %d устаревших переводов из кэша", removed)
+        except Exception as e:
+            logger.error("Ошибка при очистке кэша переводов: %s", e)
+
+    def warm_cache(self):
+        """
+        Заполнить кэш в памяти самыми свежими переводами с диска
+        После перезапуска повторяющиеся статьи сразу находятся в памяти, без запросов к SQLite
+        """
+        try:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT k, v, created_at FROM tr WHERE created_at >= ? ORDER BY created_at DESC LIMIT ?",
+                    (self._cache_cutoff(), self.MEMORY_CACHE_SIZE)
+                ).fetchall()
+                # От старых к новым, чтобы самые свежие оказались последними в LRU;
+                # время записи сохраняется, и перевод устареет в памяти тогда же, что и на диске
+                for key, value, created_at in reversed(rows):
+                    self._remember(key, value, created_at)
+            if rows:
+                logger.info("Загружено %d переводов в кэш в памяти", len(rows))
+        except Exception as e:
+            logger.error("Ошибка чтения кэша переводов: %s", e)
+
+    def close(self):
+        """Перенести WAL в основной файл кэша и закрыть базу (при остановке бота)"""
+        try:
+            with self._lock:
+                self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._db.close()
+        except Exception as e:
+            logger.error("Ошибка при закрытии кэша переводов: %s", e)
+
+    def _cache_cutoff(self) -> float:
+        """Момент времени, раньше которого переводы в кэше считаются устаревшими"""
+        return time.time() - self.CACHE_TTL_DAYS * 86400
+
+    def _cache_key(self, text: str, source_lang: str) -> str:
+        """Ключ кэша для пары (язык, текст)"""
+        return hashlib.md5(f"{source_lang}\0{text}".encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str):
+        """Найти перевод в кэше (сначала в памяти, затем на диске)"""
+        cutoff = self._cache_cutoff()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                if entry[1] >= cutoff:
+                    self._mem.move_to_end(key)
+                    return entry[0]
+                # Перевод устарел: на диске он тоже старше срока, поэтому запрашиваем заново
+                del self._mem[key]
+                return None
+            row = self._db.execute(
+                "SELECT v, created_at FROM tr WHERE k=? AND created_at >= ?", (key, cutoff)
+            ).fetchone()
+            if row:
+                self._remember(key, row[0], row[1])
+                return row[0]
+        return None
+
+    def _cache_put_many(self, items: list):
+        """Сохранить переводы [(ключ, перевод), ...] в кэш одной транзакцией"""
+        created_at = time.time()
+        with self._lock:
+            for key, value in items:
+                self._remember(key, value, created_at)
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO tr(k, v, created_at) VALUES (?, ?, ?)",
+                    [(key, value, created_at) for key, value in items]
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _remember(self, key: str, value: str, created_at: float = None):
+        """
+        Положить перевод в кэш в памяти, вытесняя самые старые записи
+        created_at - время записи перевода (по умолчанию - сейчас)
+        """
+        self._mem[key] = (value, time.time() if created_at is None else created_at)
+        self._mem.move_to_end(key)
+        if len(self._mem) > self.MEMORY_CACHE_SIZE:
+            self._mem.popitem(last=False)
 
     def translate_to_ukrainian(self, text: str, source_lang: str = "auto") -> str:
-        """Перевести текст на украинский язык"""
-        if source_lang == "uk" or not text or text == "N/A":
-            return text
+        """Перевести текст на украинский язык (тот же путь через кэш, что и для пакетов)"""
+        return self.translate_many([text], source_lang)[0]
 
+    def _request_translation(self, text: str, source_lang: str):
+        """Запросить перевод у Google Translate (None при ошибке)"""
         try:
-            base_url = "https://translate.googleapis.com/translate_a/single"
-            params = {
-                "client": "gtx",
-                "sl": source_lang,
-                "tl": self.target_lang,
-                "dt": "t",
-                "q": text
-            }
-            url = f"{base_url}?{urllib.parse.urlencode(params)}"
+            url = f"{self._translate_prefix}{source_lang}&q={urllib.parse.quote_plus(text)}"
             headers = {"User-Agent": "Mozilla/5.0"}
-            request = urllib.request.Request(url, headers=headers)
-
-            with urllib.request.urlopen(request, timeout=10) as response:
-                result = json.loads(response.read().decode("utf-8"))
-                if result and len(result) > 0 and result[0]:
-                    translated_parts = [part[0] for part in result[0] if part[0]]
-                    return "".join(translated_parts)
-                return text
+
+            result = json.loads(self._http.request("GET", url, headers=headers, timeout=10))
+            if result and len(result) > 0 and result[0]:
+                translated_parts = [part[0] for part in result[0] if part[0]]
+                return "".join(translated_parts)
+            return None
         except Exception as e:
-            logger.error(f"Ошибка при переводе: {str(e)}")
-            return text
+            logger.error("Ошибка при переводе: %s", e)
+            return None
 
     def translate_article(self, article: dict) -> dict:
-        """Перевести заголовок и описание статьи"""
-        translated = article.copy()
-        source_lang = article.get("lang", "auto")
+        """Перевести заголовок и описание статьи одним запросом (поля title_uk/description_uk добавляются в саму статью)"""
+        return self.translate_articles([article])[0]
+
+    def translate_many(self, texts: list, source_lang: str = "auto") -> list:
+        """Перевести несколько текстов, упаковывая промахи кэша в пакетные запросы"""
+        results = list(texts)
+        if source_lang == "uk":
+            return results
+
+        # Одинаковые тексты (дубли заголовков, шаблонные описания)
+        # переводятся один раз: ключ кэша -> индексы всех его вхождений
+        misses = {}
+        for i, text in enumerate(texts):
+            if not text or text == "N/A":
+                continue
+            key = self._cache_key(text, source_lang)
+            if key in misses:
+                misses[key].append(i)
+                continue
+            try:
+                cached = self._cache_get(key)
+            except Exception as e:
+                logger.error("Ошибка чтения кэша переводов: %s", e)
+                cached = None
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses[key] = [i]
+
+        if not misses:
+            return results
+
+        # Пакет ограничен и числом строк, и длиной URL запроса
+        batches = []
+        batch = []
+        batch_length = 0
+        for key, indexes in misses.items():
+            text_length = len(urllib.parse.quote_plus(texts[indexes[0]])) + 3  # + разделитель %0A
+            if batch and (len(batch) >= self.BATCH_SIZE or batch_length + text_length > self.MAX_QUERY_LENGTH):
+                batches.append(batch)
+                batch = []
+                batch_length = 0
+            batch.append((key, indexes))
+            batch_length += text_length
+        if batch:
+            batches.append(batch)
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            translated = list(executor.map(
+                lambda batch: self._translate_batch([texts[indexes[0]] for _, indexes in batch], source_lang),
+                batches
+            ))
+
+        done = []
+        for batch, values in zip(batches, translated):
+            for (key, indexes), value in zip(batch, values):
+                if value is None:
+                    continue
+                for i in indexes:
+                    results[i] = value
+                done.append((key, value))
+        # Все новые переводы записываются на диск одной транзакцией
+        if done:
+            try:
+                self._cache_put_many(done)
+            except Exception as e:
+                logger.error("Ошибка записи в кэш переводов: %s", e)
+        return results
+
+    def _translate_batch(self, texts: list, source_lang: str) -> list:
+        """
+        Перевести пакет текстов одним запросом
+        Тексты склеиваются через перевод строки, который Google сохраняет,
+        и разбиваются обратно; если число строк не совпало - пакет делится
+        пополам и каждая половина переводится отдельно, пока сбойный текст
+        не останется один
+        """
+        if len(texts) == 1:
+            return [self._request_translation(texts[0], source_lang)]
 
-        if article.get("title") and article["title"] != "N/A":
-            translated["title_uk"] = self.translate_to_ukrainian(article["title"], source_lang)
-        else:
-            translated["title_uk"] = article.get("title", "")
+        joined = "\n".join(t.replace("\r", " ").replace("\n", " ") for t in texts)
+        translated = self._request_translation(joined, source_lang)
+        if translated is None:
+            return [None] * len(texts)
 
-        if article.get("description") and article["description"] != "N/A":
-            translated["description_uk"] = self.translate_to_ukrainian(article["description"], source_lang)
-        else:
-            translated["description_uk"] = article.get("description", "")
+        parts = translated.split("\n")
+        if len(parts) == len(texts):
+            return [part.strip() for part in parts]
 
-        return translated
+        # Обычно строки "склеивает" или "разрывает" один текст, поэтому деление
+        # пополам обходится O(log n) лишними запросами вместо n запросов по одному
+        logger.warning("Пакетный перевод вернул %d строк вместо %d, пакет делится пополам", len(parts), len(texts))
+        middle = len(texts) // 2
+        return self._translate_batch(texts[:middle], source_lang) + self._translate_batch(texts[middle:], source_lang)
+
+    def translate_articles(self, articles: list) -> list:
+        """Перевести список статей пакетными запросами (по языку источника), изменяя их на месте"""
+        by_lang = {}
+        for item in articles:
+            by_lang.setdefault(item.get("lang", "auto"), []).append(item)
+
+        for lang, items in by_lang.items():
+            texts = [item.get("title", "") for item in items] + [item.get("description", "") for item in items]
+            values = self.translate_many(texts, lang)
+            for item, title, description in zip(items, values[:len(items)], values[len(items):]):
+                item["title_uk"] = title
+                item["description_uk"] = description
+
+        return articles
 
 
 # ==================== КЛАСС ДЛЯ ОТСЛЕЖИВАНИЯ ОТПРАВЛЕННЫХ НОВОСТЕЙ ====================
-class SentNewsTracker:
-    """Класс для отслеживания отправленных новостей с умной фильтрацией дублей"""
+@dataclass(slots=True)
+class SentEntry:
+    """Недавно отправленная новость в памяти: sent_at уже разобран, слова заголовка посчитаны"""
+    title: str
+    sent_at: datetime
+    tokens: frozenset
 
-    def __init__(self, filename: str = SENT_NEWS_FILE):
-        self.filename = filename
-        self.sent_news = self.load_sent_news()
 
-    def load_sent_news(self) -> dict:
-        """Загрузить историю отправленных новостей"""
+class SentNewsTracker:
+    """
+    Класс для отслеживания отправленных новостей с умной фильтрацией дублей
+    История хранится в SQLite: проверка по URL - запрос по первичному ключу,
+    в памяти держатся только недавние заголовки для поиска похожих
+    """
+
+    # Порог похожести заголовков (коэффициент Жаккара), выше которого новость - дубль
+    TITLE_SIMILARITY = 0.85
+    # Сколько дней новость считается дублем по URL и по похожему заголовку
+    URL_DUPLICATE_DAYS = 7
+    TITLE_DUPLICATE_DAYS = 3
+
+    def __init__(self, filename: str = SENT_NEWS_DB, legacy_filename: str = SENT_NEWS_FILE):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(filename, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS sent(url TEXT PRIMARY KEY, title TEXT, sent_at TEXT, tokens TEXT)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_sent_at ON sent(sent_at)")
+        self._migrate_json(legacy_filename)
+
+        # Недавние новости (URL -> SentEntry) и индекс для поиска похожих
+        # заголовков (слово -> URL записей)
+        self.recent_news = {}
+        self._title_index = {}
+        # Отпечатки URL, отправленных за последние URL_DUPLICATE_DAYS дней -> время отправки
+        self._sent_urls = {}
+        self.load_recent_news()
+
+    def _migrate_json(self, legacy_filename: str):
+        """Перенести историю из sent_news.json (прежний формат хранения) в SQLite"""
+        if not legacy_filename or not os.path.exists(legacy_filename):
+            return
         try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    logger.info(f"Загружено {len(data)} отправленных новостей")
-                    return data
+            data = read_json(legacy_filename)
+            rows = [
+                (url, entry.get('title', ''), entry.get('sent_at', ''),
+                 " ".join(entry.get('tokens') or sorted(self._tokenize(entry.get('title', '')))))
+                for url, entry in data.items()
+            ]
+            with self._lock:
+                self._db.execute("BEGIN")
+                try:
+                    self._db.executemany("INSERT OR IGNORE INTO sent(url, title, sent_at, tokens) VALUES (?, ?, ?, ?)", rows)
+                    self._db.execute("COMMIT")
+                except Exception:
+                    self._db.execute("ROLLBACK")
+                    raise
+            os.replace(legacy_filename, legacy_filename + ".migrated")
+            logger.info("Перенесено %d отправленных новостей из %s", len(rows), legacy_filename)
         except Exception as e:
-            logger.error(f"Ошибка при загрузке истории новостей: {str(e)}")
-        return {}
+            logger.error("Ошибка при переносе истории новостей: %s", e)
+
+    @staticmethod
+    def _tokenize(title: str) -> frozenset:
+        """
+        Набор слов заголовка
+        Слова интернируются: одинаковые слова разных заголовков - один объект,
+        поэтому пересечение наборов сравнивает их по ссылке, а память не дублируется
+        """
+        return frozenset(map(sys.intern, title.lower().split()))
+
+    def _title_prefix(self, words: frozenset) -> list:
+        """
+        Слова заголовка, по которым он индексируется (префикс-фильтр)
+        Если похожесть двух наборов слов не меньше порога t, то их префиксы длины
+        |x| - ceil(t*|x|) + 1 (в общем порядке слов) обязательно пересекаются.
+        Поэтому индексировать и искать достаточно по нескольким словам, а точный
+        коэффициент считать только для найденных кандидатов
+        """
+        ordered = sorted(words)
+        # Небольшой допуск защищает от ошибки округления при умножении
+        return ordered[:len(ordered) - math.ceil(self.TITLE_SIMILARITY * len(ordered) - 1e-9) + 1]
 
-    def save_sent_news(self):
-        """Сохранить историю отправленных новостей"""
+    def _remember(self, url: str, entry: SentEntry):
+        """Добавить запись в память и ее заголовок в индекс"""
+        self.recent_news[url] = entry
+        for word in self._title_prefix(entry.tokens):
+            self._title_index.setdefault(word, set()).add(url)
+
+    def load_recent_news(self):
+        """
+        Загрузить в память URL новостей, отправленных за последние URL_DUPLICATE_DAYS дней,
+        и заголовки отправленных за последние TITLE_DUPLICATE_DAYS дней
+        """
+        self.recent_news = {}
+        self._title_index = {}
+        self._sent_urls = {}
+        now = datetime.now()
+        cutoff = (now - timedelta(days=self.URL_DUPLICATE_DAYS)).isoformat()
+        title_window = timedelta(days=self.TITLE_DUPLICATE_DAYS)
         try:
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump(self.sent_news, f, ensure_ascii=False, indent=2)
-            logger.info(f"Сохранено {len(self.sent_news)} записей отправленных новостей")
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT url, title, sent_at, tokens FROM sent WHERE sent_at > ?", (cutoff,)
+                ).fetchall()
+            for url, title, sent_at, tokens in rows:
+                try:
+                    sent_dt = datetime.fromisoformat(sent_at)
+                except (TypeError, ValueError):
+                    continue
+                self._sent_urls[url_fingerprint(url)] = sent_dt
+                if now - sent_dt < title_window:
+                    words = frozenset(map(sys.intern, tokens.split())) if tokens is not None else self._tokenize(title)
+                    self._remember(url, SentEntry(title, sent_dt, words))
+            logger.info("Загружено %d недавно отправленных новостей", len(self.recent_news))
         except Exception as e:
-            logger.error(f"Ошибка при сохранении истории новостей: {str(e)}")
+            logger.error("Ошибка при загрузке истории новостей: %s", e)
+
+    def _prune_recent(self, now: datetime):
+        """Убрать из памяти записи, вышедшие из окон проверки URL и заголовков"""
+        url_window = timedelta(days=self.URL_DUPLICATE_DAYS)
+        self._sent_urls = {fp: sent_dt for fp, sent_dt in self._sent_urls.items() if now - sent_dt < url_window}
+        window = timedelta(days=self.TITLE_DUPLICATE_DAYS)
+        entries = [(url, entry) for url, entry in self.recent_news.items() if now - entry.sent_at < window]
+        self.recent_news = {}
+        self._title_index = {}
+        for url, entry in entries:
+            self._remember(url, entry)
+
+    def is_sent(self, url: str, now: datetime = None) -> bool:
+        """Была ли новость с этим URL отправлена за последние URL_DUPLICATE_DAYS дней (без обращения к БД)"""
+        sent_dt = self._sent_urls.get(url_fingerprint(url))
+        if sent_dt is None:
+            return False
+        return (now or datetime.now()) - sent_dt < timedelta(days=self.URL_DUPLICATE_DAYS)
 
     def is_duplicate(self, url: str, title: str) -> bool:
         """
         Проверить, является ли новость дубликатом
         Проверяем по URL и по похожести заголовка
         """
-        # Проверка по точному URL
-        if url in self.sent_news:
-            sent_time = self.sent_news[url].get('sent_at')
-            # Если новость была отправлена менее 7 дней назад - это дубль
-            try:
-                sent_dt = datetime.fromisoformat(sent_time)
-                if (datetime.now() - sent_dt).days < 7:
-                    logger.info(f"Дубликат по URL (отправлено {sent_time}): {url}")
-                    return True
-            except:
-                pass
+        return self.duplicate_until(url, title) is not None
+
+    def duplicate_until(self, url: str, title: str):
+        """
+        До какого момента новость считается дубликатом (None, если она не дубликат)
+        Момент определяется окном отправленной новости, с которой она совпала
+        """
+        now = datetime.now()
+
+        # Проверка по точному URL: дубль, если новость отправлена менее 7 дней назад
+        if self.is_sent(url, now):
+            logger.debug("Дубликат по URL: %s", url)
+            return self._sent_urls[url_fingerprint(url)] + timedelta(days=self.URL_DUPLICATE_DAYS)
 
         # Проверка по похожести заголовка (для случаев, когда один URL но разные домены)
-        title_lower = title.lower().strip()
-        for data in self.sent_news.values():
-            existing_title = data.get('title', '').lower().strip()
-            sent_time = data.get('sent_at')
+        # Сравниваем только с записями, найденными по индексу, а не со всей историей
+        words = self._tokenize(title)
+        candidates = set()
+        for word in self._title_prefix(words):
+            candidates.update(self._title_index.get(word, ()))
+
+        for candidate_url in candidates:
+            entry = self.recent_news.get(candidate_url)
+            if entry is None or not entry.tokens or not words:
+                continue
+            existing_words = entry.tokens
+
+            # Коэффициент Жаккара не превышает отношения размеров наборов,
+            # поэтому сильно различающиеся по длине заголовки пропускаем сразу
+            if min(len(words), len(existing_words)) / max(len(words), len(existing_words)) <= self.TITLE_SIMILARITY:
+                continue
 
             # Если заголовки очень похожи (более 85% совпадения)
-            if self._similarity(title_lower, existing_title) > 0.85:
-                try:
-                    sent_dt = datetime.fromisoformat(sent_time)
-                    # Если похожая новость была отправлена менее 3 дней назад
-                    if (datetime.now() - sent_dt).days < 3:
-                        logger.info(f"Дубликат по заголовку: '{title}' похож на '{existing_title}'")
-                        return True
-                except:
-                    pass
+            if self._similarity(words, existing_words) > self.TITLE_SIMILARITY:
+                # Если похожая новость была отправлена менее 3 дней назад
+                if (now - entry.sent_at).days < self.TITLE_DUPLICATE_DAYS:
+                    logger.debug("Дубликат по заголовку: '%s' похож на '%s'", title, entry.title)
+                    return entry.sent_at + timedelta(days=self.TITLE_DUPLICATE_DAYS)
 
-        return False
+        return None
 
-    def _similarity(self, s1: str, s2: str) -> float:
-        """Вычислить похожесть двух строк (коэффициент Жаккара)"""
-        if not s1 or not s2:
+    def _similarity(self, words1: frozenset, words2: frozenset) -> float:
+        """Вычислить похожесть двух наборов слов (коэффициент Жаккара)"""
+        if not words1 or not words2:
             return 0.0
 
-        # Разбиваем на слова
-        words1 = set(s1.split())
-        words2 = set(s2.split())
-
         # Коэффициент Жаккара: пересечение / объединение
         intersection = len(words1 & words2)
-        union = len(words1 | words2)
-
-        return intersection / union if union > 0 else 0.0
+        return intersection / (len(words1) + len(words2) - intersection)
 
     def mark_as_sent(self, url: str, title: str):
         """Отметить новость как отправленную"""
-        self.sent_news[url] = {
-            'title': title,
-            'sent_at': datetime.now().isoformat()
-        }
-        self.save_sent_news()
+        self.mark_many_as_sent([(url, title)])
+
+    def mark_many_as_sent(self, items: list):
+        """Отметить новости [(url, title), ...] как отправленные одной транзакцией"""
+        sent_dt = datetime.now()
+        sent_at = sent_dt.isoformat()
+        entries = [(url, SentEntry(title, sent_dt, self._tokenize(title))) for url, title in items]
+        try:
+            with self._lock:
+                self._db.execute("BEGIN")
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO sent(url, title, sent_at, tokens) VALUES (?, ?, ?, ?)",
+                        [(url, entry.title, sent_at, " ".join(sorted(entry.tokens))) for url, entry in entries]
+                    )
+                    self._db.execute("COMMIT")
+                except Exception:
+                    self._db.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            logger.error("Ошибка при сохранении истории новостей: %s", e)
+
+        for url, entry in entries:
+            self._sent_urls[url_fingerprint(url)] = entry.sent_at
+            self._remember(url, entry)
 
     def cleanup_old_entries(self, days: int = 30):
         """Удалить записи старше N дней"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        initial_count = len(self.sent_news)
+        now = datetime.now()
+        cutoff = (now - timedelta(days=days)).isoformat()
+        try:
+            with self._lock:
+                removed = self._db.execute("DELETE FROM sent WHERE sent_at < ?", (cutoff,)).rowcount
+            if removed > 0:
+                logger.info("Удалено %d старых записей (старше %d дней)", removed, days)
+        except Exception as e:
+            logger.error("Ошибка при очистке истории новостей: %s", e)
 
-        self.sent_news = {
-            url: data for url, data in self.sent_news.items()
-            if datetime.fromisoformat(data['sent_at']) > cutoff_date
-        }
+        # Заодно убираем из памяти заголовки, вышедшие из окна проверки
+        self._prune_recent(now)
 
-        removed = initial_count - len(self.sent_news)
-        if removed > 0:
-            logger.info(f"Удалено {removed} старых записей (старше {days} дней)")
-            self.save_sent_news()
+    def close(self):
+        """Перенести WAL в основной файл истории и закрыть базу (при остановке бота)"""
+        try:
+            with self._lock:
+                self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._db.close()
+        except Exception as e:
+            logger.error("Ошибка при закрытии истории новостей: %s", e)
 
 
 # ==================== КЛАСС ДЛЯ ПОЛУЧЕНИЯ НОВОСТЕЙ ====================
 class NewsFetcher:
     """Класс для получения новостей из GNews API"""
 
+    MAX_WORKERS = GNEWS_MAX_WORKERS
+    # Сколько статей запрашивать на один запрос
+    MAX_RESULTS = 10
+    _http = http_client
+    _rl = RateLimiter(5, 5)
+    # Сколько отпечатков статей-дублей помнить между циклами (LRU)
+    KNOWN_DUPLICATES_SIZE = 200_000
+
     def __init__(self, api_key: str, sent_news_tracker: SentNewsTracker):
         self.api_key = api_key
         self.base_url = "https://gnews.io/api/v4"
@@ -453,153 +1197,427 @@ class NewsFetcher:
             {"query": "банкрутство підприємств 2025", "lang": "uk", "theme": "Банкрутство бізнесу"},
         ]
 
-    def search_news(self, query: str, lang: str, from_date: str = None, to_date: str = None, max_results: int = 10):
-        """Поиск новостей по запросу"""
-        url = f"{self.base_url}/search?q={urllib.parse.quote(query)}&lang={lang}&max={max_results}&apikey={self.api_key}"
-        if from_date:
-            url += f"&from={from_date}"
-        if to_date:
-            url += f"&to={to_date}"
+        # Одинаковые пары (query, lang) с разными темами дают один и тот же ответ API,
+        # поэтому запрос выполняется один раз, а статьи получают первую из тем
+        self._dispatch = {}
+        for q in self.queries:
+            self._dispatch.setdefault((q["query"], q["lang"]), []).append(q["theme"])
+        # Параметры запросов хранятся параллельными кортежами (текст, язык, тема)
+        self._q_text = tuple(query for query, _ in self._dispatch)
+        self._q_lang = tuple(lang for _, lang in self._dispatch)
+        self._q_theme = tuple(themes[0] for themes in self._dispatch.values())
+
+        # URL каждого запроса (с уже закодированным текстом) собирается один раз:
+        # при поиске к нему дописывается только интервал дат
+        self._url_prefixes = [
+            f"{self.base_url}/search?q={urllib.parse.quote(query)}&lang={lang}"
+            f"&max={self.MAX_RESULTS}&apikey={self.api_key}"
+            for query, lang in zip(self._q_text, self._q_lang)
+        ]
+
+        # Отпечатки статей, уже признанных дублями в прошлых циклах: окна поиска соседних
+        # проверок перекрываются, и те же статьи приходят снова - повторно сравнивать
+        # их заголовки с отправленными не нужно. Отпечаток -> момент, когда окно
+        # SentNewsTracker, по которому статья признана дублем, закроется
+        self._known_duplicates = OrderedDict()
+
+    def search_news(self, index: int, from_date: str, to_date: str):
+        """Поиск новостей по запросу с номером index"""
+        query = self._q_text[index]
+        lang = self._q_lang[index]
+        self._rl.acquire()
+        url = f"{self._url_prefixes[index]}&from={from_date}&to={to_date}"
 
         try:
-            with urllib.request.urlopen(url) as response:
-                data = json.loads(response.read().decode("utf-8"))
-                logger.info(f"[{lang}] {query}: {data.get('totalArticles', 0)}")
-                return data
+            data = json.loads(self._http.request("GET", url, timeout=10, limiter=self._rl))
+            logger.info("[%s] %s: %s", lang, query, data.get('totalArticles', 0))
+            return data
         except Exception as e:
-            logger.error(f"Ошибка при запросе {query}: {str(e)}")
+            logger.error("Ошибка при запросе %s: %s", query, e)
             return None
 
-    def get_recent_news(self, hours: int = 1) -> list:
-        """Получить новости за последние N часов"""
+    def iter_recent_news(self, hours: int = 1):
+        """
+        Получать новости за последние N часов по мере выполнения запросов
+        Новые статьи отдаются пачками - по одной на каждый ответивший запрос,
+        поэтому их обработка начинается, пока остальные запросы еще идут
+        """
         now = datetime.now()
         from_date = (now - timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:%SZ")
         to_date = now.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        all_new_articles = []
+        new_count = 0
         duplicates_count = 0
+        # Отпечатки URL, уже встреченных в этом цикле: одна и та же статья
+        # часто приходит сразу по нескольким запросам
+        seen_urls = set()
+
+        # Запросы выполняются параллельно: время цикла определяется самым
+        # медленным запросом, а не суммой задержек всех запросов
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self.search_news, i, from_date, to_date): i
+                for i in range(len(self._q_text))
+            }
+            for future in as_completed(futures):
+                articles, duplicates = self._extract_new_articles(futures[future], future.result(), seen_urls)
+                new_count += len(articles)
+                duplicates_count += duplicates
+                if articles:
+                    yield articles
+
+        logger.info("Новых статей: %d, отфильтровано дублей: %d", new_count, duplicates_count)
 
-        for query_config in self.queries:
-            data = self.search_news(query_config["query"], query_config["lang"], from_date, to_date)
-            if data and data.get("articles"):
-                for article in data["articles"]:
-                    url = article.get("url", "")
-                    title = article.get("title", "")
-
-                    # Проверяем, не является ли это дубликатом
-                    if url and not self.sent_news_tracker.is_duplicate(url, title):
-                        all_new_articles.append({
-                            "theme": query_config["theme"],
-                            "lang": query_config["lang"],
-                            "title": title,
-                            "description": article.get("description", ""),
-                            "url": url,
-                            "source": article.get("source", {}).get("name", ""),
-                            "publishedAt": article.get("publishedAt", "")
-                        })
-                    else:
+    def get_recent_news(self, hours: int = 1) -> list:
+        """Получить новости за последние N часов"""
+        return [article for batch in self.iter_recent_news(hours) for article in batch]
+
+    def _extract_new_articles(self, index: int, data: dict, seen_urls: set):
+        """Отобрать из ответа GNews на запрос index новые статьи; вернуть (статьи, число дублей)"""
+        theme = self._q_theme[index]
+        lang = self._q_lang[index]
+        new_articles = []
+        duplicates_count = 0
+        now = datetime.now()
+
+        if data and data.get("articles"):
+            for article in data["articles"]:
+                url = article.get("url", "")
+                title = article.get("title", "")
+
+                fingerprint = url_fingerprint(url)
+                if fingerprint in seen_urls:
+                    duplicates_count += 1
+                    continue
+                seen_urls.add(fingerprint)
+
+                expires = self._known_duplicates.get(fingerprint)
+                if expires is not None:
+                    if expires > now:
+                        self._known_duplicates.move_to_end(fingerprint)
                         duplicates_count += 1
-            time.sleep(0.5)
+                        continue
+                    # Окно дубля закрылось - статью снова проверяет SentNewsTracker
+                    del self._known_duplicates[fingerprint]
+
+                if not url:
+                    duplicates_count += 1
+                    continue
+
+                # Проверяем, не является ли это дубликатом
+                expires = self.sent_news_tracker.duplicate_until(url, title)
+                if expires is None:
+                    new_articles.append({
+                        "theme": theme,
+                        "lang": lang,
+                        "title": title,
+                        "description": article.get("description", ""),
+                        "url": url,
+                        "source": article.get("source", {}).get("name", ""),
+                        "publishedAt": article.get("publishedAt", ""),
+                        "image": article.get("image") or "",
+                        "date_str": format_date(article.get("publishedAt", ""))
+                    })
+                else:
+                    duplicates_count += 1
+                    self._remember_duplicate(fingerprint, expires)
+
+        return new_articles, duplicates_count
 
-        logger.info(f"Новых статей: {len(all_new_articles)}, отфильтровано дублей: {duplicates_count}")
-        return all_new_articles
+    def _remember_duplicate(self, fingerprint: int, expires: datetime):
+        """Запомнить отпечаток дубля до момента expires, вытеснив самый давний при переполнении"""
+        self._known_duplicates[fingerprint] = expires
+        if len(self._known_duplicates) > self.KNOWN_DUPLICATES_SIZE:
+            self._known_duplicates.popitem(last=False)
 
 
 # ==================== КЛАСС ДЛЯ TELEGRAM ====================
+@dataclass(slots=True)
+class PhotoGroup:
+    """
+    Альбом одной рассылки: тела запросов и то, что стало известно после первой отправки
+    Картинки по URL Telegram загружает один раз, остальным чатам альбом уходит по file_id;
+    если картинки не приняты, остальные чаты сразу получают статьи текстом
+    """
+    group: list  # [(url картинки, подпись), ...]
+    method: str
+    payload: bytes
+    fallback: list  # тела sendMessage на случай, если альбом не принят
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    uploaded: bool = False  # payload ссылается на file_id уже загруженных картинок
+    failed: bool = False
+
+
 class TelegramBot:
     """Класс для работы с Telegram API"""
 
+    _http = http_client
+    # Telegram допускает около 30 сообщений в секунду
+    _rl = RateLimiter(25, 25)
+
+    ARTICLE_TEMPLATE = string.Template(
+        "<b>📰 $theme</b>\n\n"
+        "<b>$title</b>\n\n"
+        "$desc\n\n"
+        "<b>Джерело:</b> $source\n"
+        "<b>Дата:</b> $date\n\n"
+        "<a href=\"$url\">📎 Читати оригінал</a>"
+    )
+    # Telegram ограничивает текст сообщения 4096 символами (HTML-теги в лимит не входят,
+    # так что сообщение, уложившееся в лимит с разметкой, уложится и без нее)
+    MESSAGE_LIMIT = 4096
+    MESSAGE_SEPARATOR = "\n\n───\n\n"
+    # Лимит подписи к фото и число фото в одном альбоме (sendMediaGroup)
+    CAPTION_LIMIT = 1024
+    MEDIA_GROUP_SIZE = 10
+    # Ошибка 4xx при первой отправке альбома означает, что Telegram не принял сам альбом
+    # (картинки), кроме ошибок, которые относятся к конкретному чату: 403 (бот заблокирован),
+    # 429 (лимит частоты) и описаний ниже
+    CHAT_ERROR_STATUSES = (403, 429)
+    CHAT_ERROR_MARKERS = ("chat not found", "user is deactivated", "not enough rights")
+    # Скольким подписчикам рассылка идет параллельно
+    SEND_WORKERS = 20
+    # Состояние - запись фиксированной длины (число дополняется пробелами, JSON остается
+    # корректным), поэтому ее можно перезаписывать на месте, не пересоздавая файл
+    BOT_STATE_FORMAT = '{"last_update_id": %20d}\n'
+    # Long polling: Telegram держит запрос до POLL_TIMEOUT секунд, пока не придут обновления
+    POLL_TIMEOUT = 50
+
     def __init__(self, bot_token: str, subscriber_manager: SubscriberManager):
         self.bot_token = bot_token
         self.subscriber_manager = subscriber_manager
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        # Неизменные части URL собираются один раз: для getUpdates дописывается только offset
+        self._updates_url_prefix = f"{self.base_url}/getUpdates?timeout={self.POLL_TIMEOUT}&offset="
+        self._method_urls = {
+            method: f"{self.base_url}/{method}"
+            for method in ("sendMessage", "sendPhoto", "sendMediaGroup")
+        }
         self.last_update_id = self._load_bot_state()
+        self._state_fd = os.open(BOT_STATE_FILE, os.O_RDWR | os.O_CREAT, 0o644)
+        # Переводим файл в формат фиксированной длины (старый мог быть длиннее)
+        self._save_bot_state()
+        os.ftruncate(self._state_fd, len(self.BOT_STATE_FORMAT % self.last_update_id))
+        atexit.register(self._sync_bot_state)
+        # Отдельный пул для рассылки: long polling в get_updates ей не мешает
+        self._pool = ThreadPoolExecutor(max_workers=self.SEND_WORKERS, thread_name_prefix="tg-send")
 
     def _load_bot_state(self) -> int:
         """Загрузить состояние бота (last_update_id)"""
         try:
             if os.path.exists(BOT_STATE_FILE):
-                with open(BOT_STATE_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    last_id = data.get('last_update_id', 0)
-                    logger.info(f"Загружен last_update_id: {last_id}")
-                    return last_id
+                data = read_json(BOT_STATE_FILE)
+                last_id = data.get('last_update_id', 0)
+                logger.info("Загружен last_update_id: %s", last_id)
+                return last_id
         except Exception as e:
-            logger.error(f"Ошибка при загрузке состояния бота: {str(e)}")
+            logger.error("Ошибка при загрузке состояния бота: %s", e)
         return 0
 
     def _save_bot_state(self):
         """Сохранить состояние бота (last_update_id)"""
         try:
-            with open(BOT_STATE_FILE, 'w', encoding='utf-8') as f:
-                json.dump({'last_update_id': self.last_update_id}, f, ensure_ascii=False, indent=2)
+            # Запись на месте попадает в кэш страниц ОС и переживает падение процесса;
+            # на диск файл синхронизируется при остановке (_sync_bot_state)
+            os.pwrite(self._state_fd, (self.BOT_STATE_FORMAT % self.last_update_id).encode('ascii'), 0)
         except Exception as e:
-            logger.error(f"Ошибка при сохранении состояния бота: {str(e)}")
+            logger.error("Ошибка при сохранении состояния бота: %s", e)
 
-    def get_updates(self) -> list:
-        """Получить обновления от Telegram"""
-        url = f"{self.base_url}/getUpdates?offset={self.last_update_id + 1}&timeout=30"
+    def _sync_bot_state(self):
+        """Сбросить состояние бота на диск (при завершении процесса)"""
+        try:
+            os.fdatasync(self._state_fd)
+        except Exception as e:
+            logger.error("Ошибка при сохранении состояния бота: %s", e)
+
+    def get_updates(self):
+        """
+        Получить обновления от Telegram (None при ошибке)
+        Запрос блокируется на сервере, пока не появятся обновления или не истечет POLL_TIMEOUT;
+        offset подтверждает уже обработанные обновления, и Telegram их больше не присылает
+        """
+        url = self._updates_url_prefix + str(self.last_update_id + 1)
         try:
-            with urllib.request.urlopen(url, timeout=35) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                if result.get('ok'):
-                    updates = result.get('result', [])
-                    if updates:
-                        logger.info(f"📨 Получено обновлений: {len(updates)}")
-                    return updates
+            result = json.loads(self._http.request("GET", url, timeout=self.POLL_TIMEOUT + 5))
+            if result.get('ok'):
+                updates = result.get('result', [])
+                if updates:
+                    logger.info("📨 Получено обновлений: %d", len(updates))
+                return updates
+            logger.error("Ошибка получения обновлений: %s", result)
         except Exception as e:
-            logger.error(f"Ошибка получения обновлений: {str(e)}")
-        return []
-
-    def send_message(self, chat_id: str, text: str) -> bool:
-        """Отправить сообщение"""
-        url = f"{self.base_url}/sendMessage"
-        data = urllib.parse.urlencode({
-            "chat_id": chat_id,
+            logger.error("Ошибка получения обновлений: %s", e)
+        return None
+
+    def _encode_message(self, text: str, preview: bool = True) -> bytes:
+        """
+        Закодировать общую часть тела sendMessage (все, кроме chat_id)
+        При рассылке она кодируется один раз на сообщение, а не на каждого подписчика
+        """
+        return json.dumps({
             "text": text,
             "parse_mode": "HTML",
-            "disable_web_page_preview": False
+            "disable_web_page_preview": not preview
         }).encode('utf-8')
 
-        try:
-            with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=10) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                success = result.get('ok', False)
-                if success:
-                    logger.info(f"✅ Сообщение отправлено в {chat_id}")
-                else:
-                    logger.error(f"❌ Ошибка отправки в {chat_id}: {result}")
-                return success
-        except Exception as e:
-            logger.error(f"❌ Ошибка отправки в {chat_id}: {str(e)}")
-            return False
+    def send_message(self, chat_id: str, text: str, preview: bool = True) -> bool:
+        """Отправить сообщение (preview=False - без предпросмотра ссылок)"""
+        return self._send_encoded(chat_id, self._encode_message(text, preview))
 
-    def format_article(self, article: dict) -> str:
-        """Форматировать статью"""
-        title = article.get("title_uk", article.get("title", ""))
-        desc = article.get("description_uk", article.get("description", ""))
-        theme = article.get("theme", "Новини")
-        source = article.get("source", "")
-        url = article.get("url", "")
-        date = article.get("publishedAt", "")
-
-        if date:
+    def _encode_photos(self, group: list) -> tuple:
+        """
+        Закодировать статьи с картинками [(url картинки, подпись), ...] для отправки без chat_id;
+        вернуть (метод API, тело). Альбом (sendMediaGroup) допускает от 2 до 10 элементов,
+        поэтому одна картинка отправляется через sendPhoto
+        """
+        if len(group) == 1:
+            image, caption = group[0]
+            return "sendPhoto", json.dumps({"photo": image, "caption": caption, "parse_mode": "HTML"}).encode('utf-8')
+        return "sendMediaGroup", json.dumps({"media": [
+            {"type": "photo", "media": image, "caption": caption, "parse_mode": "HTML"}
+            for image, caption in group
+        ]}).encode('utf-8')
+
+    def _send_photos(self, chat_id: str, album: PhotoGroup) -> bool:
+        """
+        Отправить альбом рассылки (PhotoGroup)
+        Каждое фото альбома Telegram считает отдельным сообщением, поэтому альбом занимает
+        в лимите частоты столько токенов, сколько в нем фото, а замена текстом - по токену
+        на отправленное сообщение; непринятый альбом повторно не отправляется
+        """
+        sent = None
+        if not (album.uploaded or album.failed):
+            with album.lock:
+                # Картинки по URL загружает первая отправка, остальные чаты ждут ее итога
+                if not (album.uploaded or album.failed):
+                    sent = self._upload_photos(chat_id, album)
+        if sent is None and not album.failed:
+            sent = self._send_encoded(chat_id, album.payload, method=album.method, tokens=len(album.group))
+        if sent:
+            return True
+        logger.warning("Альбом не отправлен в %s, отправка текстом", chat_id)
+        results = [self._send_encoded(chat_id, message) for message in album.fallback]
+        return all(results)
+
+    def _upload_photos(self, chat_id: str, album: PhotoGroup) -> bool:
+        """
+        Первая отправка альбома с картинками по URL
+        При успехе тело альбома пересобирается по file_id из ответа; если Telegram
+        отклонил сами картинки (а не чат), альбом помечается как непринятый
+        """
+        status = None
+        description = ""
+        try:
+            result = json.loads(self._post(chat_id, album.payload, album.method, len(album.group)))
+            if result.get("ok"):
+                messages = result.get("result") or []
+                if isinstance(messages, dict):
+                    messages = [messages]
+                try:
+                    # У фото в ответе несколько размеров, последний - исходный
+                    file_ids = [message["photo"][-1]["file_id"] for message in messages]
+                except (KeyError, IndexError, TypeError):
+                    file_ids = []
+                if file_ids and len(file_ids) == len(album.group):
+                    album.method, album.payload = self._encode_photos(
+                        [(file_id, caption) for file_id, (_, caption) in zip(file_ids, album.group)]
+                    )
+                    album.uploaded = True
+                logger.info("✅ Сообщение отправлено в %s", chat_id)
+                return True
+            status = result.get("error_code")
+            description = result.get("description", "")
+            logger.error("❌ Ошибка отправки в %s: %s", chat_id, result)
+        except HttpError as e:
+            status = e.status
             try:
-                dt = datetime.fromisoformat(date.replace('Z', '+00:00'))
-                date = dt.strftime("%d.%m.%Y %H:%M")
-            except:
+                description = json.loads(e.body).get("description", "")
+            except (ValueError, AttributeError):
                 pass
+            logger.error("❌ Ошибка отправки в %s: %s %s", chat_id, e, description)
+        except Exception as e:
+            logger.error("❌ Ошибка отправки в %s: %s", chat_id, e)
 
-        return f"""<b>📰 {theme}</b>
-
-<b>{title}</b>
-
-{desc}
+        # Сетевые ошибки и 5xx не говорят ничего о картинках: следующий чат попробует снова
+        if (isinstance(status, int) and 400 <= status < 500
+                and status not in self.CHAT_ERROR_STATUSES
+                and not any(marker in description.lower() for marker in self.CHAT_ERROR_MARKERS)):
+            album.failed = True
+        return False
 
-<b>Джерело:</b> {source}
-<b>Дата:</b> {date}
+    def _post(self, chat_id: str, payload: bytes, method: str = "sendMessage", tokens: int = 1) -> bytes:
+        """
+        Выполнить запрос с уже закодированным телом (без chat_id) и вернуть тело ответа
+        tokens - сколько сообщений займет отправка в лимите частоты
+        """
+        for _ in range(tokens):
+            self._rl.acquire()
+        url = self._method_urls.get(method) or f"{self.base_url}/{method}"
+        # Дописываем chat_id в начало готового JSON-объекта
+        data = b'{"chat_id":' + json.dumps(chat_id).encode('utf-8') + b',' + payload[1:]
+        headers = {"Content-Type": "application/json"}
+        return self._http.request("POST", url, body=data, headers=headers, timeout=10, limiter=self._rl)
+
+    def _send_encoded(self, chat_id: str, payload: bytes, method: str = "sendMessage", tokens: int = 1) -> bool:
+        """
+        Отправить сообщение, тело которого уже закодировано (без chat_id)
+        tokens - сколько сообщений займет отправка в лимите частоты (альбом считается по фото)
+        """
+        try:
+            body = self._post(chat_id, payload, method, tokens)
+            # Успешный ответ Telegram начинается с {"ok":true - разбирать
+            # JSON целиком нужно только для ошибки
+            if body.startswith(b'{"ok":true'):
+                logger.info("✅ Сообщение отправлено в %s", chat_id)
+                return True
+
+            result = json.loads(body)
+            success = result.get('ok', False)
+            if success:
+                logger.info("✅ Сообщение отправлено в %s", chat_id)
+            else:
+                logger.error("❌ Ошибка отправки в %s: %s", chat_id, result)
+            return success
+        except Exception as e:
+            logger.error("❌ Ошибка отправки в %s: %s", chat_id, e)
+            return False
 
-<a href="{url}">📎 Читати оригінал</a>"""
+    def format_article(self, article: dict) -> str:
+        """Форматировать статью"""
+        return self.ARTICLE_TEMPLATE.substitute(
+            theme=html.escape(article.get("theme") or "Новини"),
+            title=html.escape(article.get("title_uk", article.get("title")) or ""),
+            desc=html.escape(article.get("description_uk", article.get("description")) or ""),
+            source=html.escape(article.get("source") or ""),
+            date=html.escape(article.get("date_str") or format_date(article.get("publishedAt") or "")),
+            # URL стоит в атрибуте href: кавычка или & в нем сломали бы разбор HTML в Telegram
+            url=html.escape(article.get("url") or "", quote=True)
+        )
+
+    def _pack_messages(self, formatted: list) -> list:
+        """
+        Склеить отформатированные статьи в сообщения не длиннее MESSAGE_LIMIT
+        Статьи берутся по порядку и добавляются к текущему сообщению, пока оно
+        укладывается в лимит; статья длиннее лимита уходит отдельным сообщением
+        """
+        separator = self.MESSAGE_SEPARATOR
+        packed = []
+        # Части текущего сообщения и его длина с разделителями: строка собирается
+        # одним join, а не перекопированием при каждом добавлении статьи
+        current = []
+        length = 0
+        for text in formatted:
+            if current and length + len(separator) + len(text) <= self.MESSAGE_LIMIT:
+                current.append(text)
+                length += len(separator) + len(text)
+            else:
+                if current:
+                    packed.append(separator.join(current))
+                current = [text]
+                length = len(text)
+        if current:
+            packed.append(separator.join(current))
+        return packed
 
     def broadcast_articles(self, articles: list, sent_news_tracker: SentNewsTracker):
         """Разослать статьи всем подписчикам"""
@@ -612,73 +1630,122 @@ class TelegramBot:
             logger.info("Нет новых статей для рассылки")
             return
 
-        logger.info(f"Рассылка {len(articles)} статей для {len(subscribers)} подписчиков")
+        # Статьи, уже отправленные (например, пока шла загрузка), повторно не рассылаем
+        articles = [article for article in articles if not sent_news_tracker.is_sent(article.get('url', ''))]
+        if not articles:
+            logger.info("Нет новых статей для рассылки")
+            return
+
+        logger.info("Рассылка %d статей для %d подписчиков", len(articles), len(subscribers))
 
         # Отмечаем новости как отправленные сразу, чтобы не отправлять их повторно
+        sent_news_tracker.mark_many_as_sent([
+            (article.get('url', ''), article.get('title_uk', article.get('title', '')))
+            for article in articles
+        ])
+
+        # Сообщения одинаковы для всех подписчиков, поэтому собираются (и кодируются) один раз.
+        # Статьи с картинкой, у которых текст помещается в подпись, уходят альбомами
+        # по MEDIA_GROUP_SIZE штук, остальные склеиваются в текстовые сообщения.
+        # В склеенном сообщении несколько ссылок, и предпросмотр показал бы только первую,
+        # поэтому при рассылке он отключен: Telegram не нужно загружать страницы
+        photos = []
+        texts = []
         for article in articles:
-            sent_news_tracker.mark_as_sent(
-                article.get('url', ''),
-                article.get('title_uk', article.get('title', ''))
-            )
-
-        # Рассылаем новости всем подписчикам
-        for chat_id in subscribers:
-            self.send_message(chat_id, f"<b>🔔 Знайдено {len(articles)} нових статей</b>")
-            for article in articles:
-                message = self.format_article(article)
-                self.send_message(chat_id, message)
-                time.sleep(0.5)
-            self.send_message(chat_id, f"<b>✅ Усі новини відправлено</b>")
-
-    def process_updates(self):
-        """Обработать обновления (команды пользователей)"""
+            text = self.format_article(article)
+            image = article.get("image")
+            if image and len(text) <= self.CAPTION_LIMIT:
+                photos.append((image, text))
+            else:
+                texts.append(text)
+
+        jobs = [partial(self._send_encoded, payload=self._encode_message(
+            f"<b>🔔 Знайдено {len(articles)} нових статей</b>", preview=False))]
+        for i in range(0, len(photos), self.MEDIA_GROUP_SIZE):
+            group = photos[i:i + self.MEDIA_GROUP_SIZE]
+            method, payload = self._encode_photos(group)
+            fallback = [self._encode_message(text, preview=False) for text in self._pack_messages([text for _, text in group])]
+            jobs.append(partial(self._send_photos, album=PhotoGroup(group, method, payload, fallback)))
+        for text in self._pack_messages(texts) + [f"<b>✅ Усі новини відправлено</b>"]:
+            jobs.append(partial(self._send_encoded, payload=self._encode_message(text, preview=False)))
+
+        # Подписчики обслуживаются параллельно, а сообщения одному подписчику
+        # отправляются по очереди в одной задаче, так что порядок в чате сохраняется,
+        # и медленный чат не задерживает остальных. Общий темп ограничивает self._rl
+        def send_all(chat_id):
+            for job in jobs:
+                job(chat_id)
+
+        list(self._pool.map(send_all, subscribers))
+
+    def process_updates(self) -> bool:
+        """Обработать обновления (команды пользователей); False, если получить их не удалось"""
         updates = self.get_updates()
-        for update in updates:
-            self.last_update_id = update.get('update_id', 0)
-            self._save_bot_state()  # Сохраняем после каждого обновления
-
-            message = update.get('message', {})
-            chat_id = str(message.get('chat', {}).get('id', ''))
-            text = message.get('text', '')
-            username = message.get('from', {}).get('username', 'Unknown')
-
-            logger.info(f"👤 Команда от @{username} (ID: {chat_id}): {text}")
-
-            if text == '/start':
-                if self.subscriber_manager.add_subscriber(chat_id):
-                    logger.info(f"✅ Новый подписчик: @{username} ({chat_id})")
-                    self.send_message(chat_id,
-                        "<b>✅ Вітаємо!</b>\n\n"
-                        "Ви підписались на фінансові новини.\n"
-                        "Ви будете отримувати переведені новини кожні 3 години.\n\n"
-                        "Команди:\n"
-                        "/start - Підписатись\n"
-                        "/stop - Відписатись\n"
-                        "/status - Статус підписки"
-                    )
-                else:
-                    logger.info(f"ℹ️ Повторная подписка: @{username} ({chat_id})")
-                    self.send_message(chat_id, "<b>ℹ️ Ви вже підписані</b>")
-
-            elif text == '/stop':
-                if self.subscriber_manager.remove_subscriber(chat_id):
-                    logger.info(f"👋 Отписка: @{username} ({chat_id})")
-                    self.send_message(chat_id, "<b>👋 Ви відписались від новин</b>")
-                else:
-                    logger.info(f"ℹ️ Попытка отписки незарегистрированного: @{username} ({chat_id})")
-                    self.send_message(chat_id, "<b>ℹ️ Ви не були підписані</b>")
-
-            elif text == '/status':
-                is_subscribed = chat_id in self.subscriber_manager.get_subscribers()
-                status = "✅ Підписано" if is_subscribed else "❌ Не підписано"
-                logger.info(f"ℹ️ Проверка статуса: @{username} ({chat_id}) - {status}")
-                self.send_message(chat_id, f"<b>Статус:</b> {status}")
+        if updates is None:
+            return False
+        try:
+            for update in updates:
+                self.last_update_id = update.get('update_id', 0)
+                self._handle_update(update)
+        finally:
+            # Состояние сохраняется один раз на пачку, а не после каждого обновления
+            if updates:
+                self._save_bot_state()
+        return True
+
+    def _handle_update(self, update: dict):
+        """Обработать одно обновление (команду пользователя)"""
+        message = update.get('message', {})
+        chat_id = str(message.get('chat', {}).get('id', ''))
+        text = message.get('text', '')
+        username = message.get('from', {}).get('username', 'Unknown')
+
+        logger.info("👤 Команда от @%s (ID: %s): %s", username, chat_id, text)
+
+        if text == '/start':
+            if self.subscriber_manager.add_subscriber(chat_id):
+                logger.info("✅ Новый подписчик: @%s (%s)", username, chat_id)
+                self.send_message(chat_id,
+                    "<b>✅ Вітаємо!</b>\n\n"
+                    "Ви підписались на фінансові новини.\n"
+                    "Ви будете отримувати переведені новини кожні 3 години.\n\n"
+                    "Команди:\n"
+                    "/start - Підписатись\n"
+                    "/stop - Відписатись\n"
+                    "/status - Статус підписки"
+                )
+            else:
+                logger.info("ℹ️ Повторная подписка: @%s (%s)", username, chat_id)
+                self.send_message(chat_id, "<b>ℹ️ Ви вже підписані</b>")
+
+        elif text == '/stop':
+            if self.subscriber_manager.remove_subscriber(chat_id):
+                logger.info("👋 Отписка: @%s (%s)", username, chat_id)
+                self.send_message(chat_id, "<b>👋 Ви відписались від новин</b>")
+            else:
+                logger.info("ℹ️ Попытка отписки незарегистрированного: @%s (%s)", username, chat_id)
+                self.send_message(chat_id, "<b>ℹ️ Ви не були підписані</b>")
+
+        elif text == '/status':
+            is_subscribed = self.subscriber_manager.is_subscribed(chat_id)
+            status = "✅ Підписано" if is_subscribed else "❌ Не підписано"
+            logger.info("ℹ️ Проверка статуса: @%s (%s) - %s", username, chat_id, status)
+            self.send_message(chat_id, f"<b>Статус:</b> {status}")
 
 
 # ==================== ОСНОВНОЙ КЛАСС БОТА ====================
 class NewsMonitorBot:
     """Основной бот"""
 
+    # Сколько пачек статей переводится одновременно во время загрузки
+    PIPELINE_WORKERS = 4
+    # С какого числа статей одного языка начинать перевод во время загрузки: у статьи
+    # два текста (заголовок и описание), так что пачка заполняет целый запрос к Google
+    PIPELINE_BATCH_ARTICLES = Translator.BATCH_SIZE // 2
+    # Пауза (секунды) между опросами обновлений после ошибок
+    COMMANDS_MIN_BACKOFF = 0.1
+    COMMANDS_MAX_BACKOFF = 5.0
+
     def __init__(self, gnews_api_key: str, telegram_bot_token: str):
         self.subscriber_manager = SubscriberManager()
         self.sent_news_tracker = SentNewsTracker()
@@ -686,28 +1753,61 @@ class NewsMonitorBot:
         self.translator = Translator()
         self.telegram_bot = TelegramBot(telegram_bot_token, self.subscriber_manager)
         self.running = True
+        # Прерывает ожидание между итерациями при остановке бота
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Остановить бота после завершения текущей итерации"""
+        self.running = False
+        self._stop_event.set()
 
     def check_commands_loop(self):
         """Поток для обработки команд"""
         logger.info("Запущен обработчик команд")
+        # Пауза после ошибки растет экспоненциально до COMMANDS_MAX_BACKOFF
+        # и сбрасывается после первого успешного запроса
+        backoff = 0.0
         while self.running:
+            # get_updates сам ждет на сервере (long polling), поэтому пауза
+            # нужна только после ошибки, чтобы не долбить API
             try:
-                self.telegram_bot.process_updates()
+                ok = self.telegram_bot.process_updates()
             except Exception as e:
-                logger.error(f"Ошибка в обработчике команд: {str(e)}")
-            time.sleep(1)
+                logger.error("Ошибка в обработчике команд: %s", e)
+                ok = False
+            if ok:
+                backoff = 0.0
+            else:
+                backoff = min(self.COMMANDS_MAX_BACKOFF, max(self.COMMANDS_MIN_BACKOFF, backoff * 2))
+                self._stop_event.wait(backoff)
 
     def check_and_send_news(self, hours: int = 1):
         """Проверить и отправить новости"""
-        logger.info(f"Проверка новостей за {hours} час(ов)...")
-        articles = self.news_fetcher.get_recent_news(hours)
-
-        if not articles:
+        logger.info("Проверка новостей за %d час(ов)...", hours)
+
+        # Конвейер: статьи уходят на перевод, пока остальные запросы к GNews еще
+        # выполняются. Ответ одного запроса обычно дает лишь несколько статей, поэтому
+        # они копятся по языкам до полной пачки: иначе вместо пакетного перевода
+        # получилось бы много маленьких запросов
+        pending = {}
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.PIPELINE_WORKERS) as executor:
+            for batch in self.news_fetcher.iter_recent_news(hours):
+                for article in batch:
+                    articles = pending.setdefault(article.get("lang", "auto"), [])
+                    articles.append(article)
+                    if len(articles) >= self.PIPELINE_BATCH_ARTICLES:
+                        futures.append(executor.submit(self.translator.translate_articles, articles))
+                        del pending[article.get("lang", "auto")]
+            # Остатки переводятся после загрузки - по одной пачке на язык
+            for articles in pending.values():
+                futures.append(executor.submit(self.translator.translate_articles, articles))
+        translated = [article for future in futures for article in future.result()]
+
+        if not translated:
             return
 
-        logger.info(f"Перевод {len(articles)} статей...")
-        translated = [self.translator.translate_article(a) for a in articles]
-
+        logger.info("Переведено %d статей", len(translated))
         logger.info("Рассылка новостей...")
         self.telegram_bot.broadcast_articles(translated, self.sent_news_tracker)
 
@@ -718,7 +1818,11 @@ class NewsMonitorBot:
             return
 
         logger.info("🤖 Бот запущен")
-        logger.info(f"Подписчиков: {len(self.subscriber_manager.get_subscribers())}")
+        logger.info("Подписчиков: %d", len(self.subscriber_manager.get_subscribers()))
+
+        # SIGTERM (например, при перезапуске на Render) завершает бота
+        # после текущей итерации, не дожидаясь конца паузы
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
 
         # Запускаем обработчик команд в отдельном потоке
         commands_thread = threading.Thread(target=self.check_commands_loop, daemon=True)
@@ -726,28 +1830,38 @@ class NewsMonitorBot:
 
         iteration = 0
         try:
-            while True:
+            while self.running:
                 iteration += 1
-                logger.info(f"\n{'='*80}")
-                logger.info(f"Итерация #{iteration} | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                logger.info(f"{'='*80}")
+                logger.info("\n" + "=" * 80)
+                logger.info("Итерация #%d | %s", iteration, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                logger.info("=" * 80)
 
                 self.check_and_send_news(hours=CHECK_HOURS)
 
                 # Периодически очищаем старые записи (раз в сутки)
                 if iteration % 24 == 0:
                     self.sent_news_tracker.cleanup_old_entries(days=30)
+                    self.translator.cleanup_cache()
 
-                logger.info(f"Следующая проверка через {CHECK_INTERVAL_MINUTES} мин...")
-                time.sleep(CHECK_INTERVAL_MINUTES * 60)
+                logger.info("Следующая проверка через %d мин...", CHECK_INTERVAL_MINUTES)
+                self._stop_event.wait(CHECK_INTERVAL_MINUTES * 60)
 
         except KeyboardInterrupt:
-            logger.info("\n\n👋 Остановка бота...")
-            self.running = False
+            pass
+
+        logger.info("\n\n👋 Остановка бота...")
+        self.stop()
+        # Базы используются только этим потоком: после выхода из цикла их можно закрыть
+        self.subscriber_manager.flush()
+        self.sent_news_tracker.close()
+        self.translator.close()
 
 
 # ==================== ГЛАВНАЯ ФУНКЦИЯ ====================
 def main():
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
     print("="*80)
     print(" "*15 + "БОТ МОНИТОРИНГА ФИНАНСОВЫХ НОВОСТЕЙ")
     print("="*80)
@@ -0,0 +1,13 @@
+"""Общая подготовка окружения для тестов: переменные, которые news_bot читает при импорте"""
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("CHECK_INTERVAL_MINUTES", "60")
+os.environ.setdefault("CHECK_HOURS", "1")
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp())
+# Модуль при импорте создает news_bot.log в текущей директории
+os.chdir(os.environ["DATA_DIR"])
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import news_bot  # noqa: E402,F401
@@ -0,0 +1,164 @@
+import ssl
+import unittest
+from unittest import mock
+
+from helpers import news_bot
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self.reason = "reason"
+        self.will_close = False
+        self._body = body
+        self._headers = headers or {}
+
+    def read(self):
+        return self._body
+
+    def getheader(self, name):
+        return self._headers.get(name)
+
+
+class FakeSocket:
+    def settimeout(self, timeout):
+        pass
+
+
+class FakeConnection:
+    """Соединение, которое отвечает по сценарию: исключение или FakeResponse на каждый запрос"""
+
+    script = []
+    created = []
+
+    def __init__(self, host, timeout=None):
+        self.sock = FakeSocket()
+        self.closed = False
+        self.requests = []
+        FakeConnection.created.append(self)
+
+    def request(self, method, path, body=None, headers=None):
+        self.requests.append(method)
+        self._outcome = FakeConnection.script.pop(0)
+
+    def getresponse(self):
+        if isinstance(self._outcome, BaseException):
+            raise self._outcome
+        return self._outcome
+
+    def close(self):
+        self.closed = True
+
+
+class HttpClientTestCase(unittest.TestCase):
+    def setUp(self):
+        FakeConnection.script = []
+        FakeConnection.created = []
+        patcher = mock.patch.object(news_bot.http.client, "HTTPSConnection", FakeConnection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sleep = mock.patch.object(news_bot.time, "sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+        self.client = news_bot.HttpClient()
+
+    def pooled(self, released_ago=0.0):
+        """Положить в пул соединение, возвращенное released_ago секунд назад"""
+        conn = FakeConnection("host")
+        self.client._idle.setdefault("host", []).append((conn, news_bot.time.monotonic() - released_ago))
+        return conn
+
+
+class PoolTest(HttpClientTestCase):
+    def test_idle_connection_is_reused(self):
+        conn = self.pooled()
+        FakeConnection.script = [FakeResponse(200, b"ok")]
+        self.assertEqual(self.client.request("GET", "https://host/x"), b"ok")
+        self.assertEqual(conn.requests, ["GET"])
+
+    def test_expired_connection_is_closed(self):
+        conn = self.pooled(released_ago=self.client.IDLE_TIMEOUT + 1)
+        FakeConnection.script = [FakeResponse(200, b"ok")]
+        self.assertEqual(self.client.request("GET", "https://host/x"), b"ok")
+        self.assertTrue(conn.closed)
+        self.assertEqual(conn.requests, [])
+
+    def test_pooled_get_retries_on_os_error(self):
+        for error in (TimeoutError(), ssl.SSLEOFError(), ConnectionResetError()):
+            with self.subTest(type(error).__name__):
+                # Запрос берет последнее соединение из пула (other) и падает;
+                # оставшееся в пуле (stale) для повтора не берется - он идет по новому
+                stale = self.pooled()
+                other = self.pooled()
+                FakeConnection.script = [error, FakeResponse(200, b"ok")]
+                self.assertEqual(self.client.request("GET", "https://host/x"), b"ok")
+                self.assertTrue(other.closed)
+                self.assertEqual(stale.requests, [])
+                fresh = FakeConnection.created[-1]
+                self.assertNotIn(fresh, (stale, other))
+                self.assertEqual(fresh.requests, ["GET"])
+                self.client._idle.clear()
+
+    def test_pooled_post_timeout_is_not_replayed(self):
+        self.pooled()
+        FakeConnection.script = [TimeoutError()]
+        with self.assertRaises(TimeoutError):
+            self.client.request("POST", "https://host/x", body=b"{}")
+
+
+class RetryTest(HttpClientTestCase):
+    def test_429_is_retried_for_any_method(self):
+        for method in ("GET", "POST"):
+            with self.subTest(method):
+                FakeConnection.script = [FakeResponse(429, headers={"Retry-After": "2"}), FakeResponse(200, b"ok")]
+                self.assertEqual(self.client.request(method, "https://host/x", body=b"{}"), b"ok")
+                self.sleep.assert_called_with(2.0)
+
+    def test_429_penalizes_limiter(self):
+        limiter = news_bot.RateLimiter(10, 10)
+        FakeConnection.script = [FakeResponse(429, headers={"Retry-After": "3"}), FakeResponse(200, b"ok")]
+        self.client.request("POST", "https://host/x", body=b"{}", limiter=limiter)
+        self.assertLessEqual(limiter._tokens, -30)
+
+    def test_5xx_is_retried_only_for_get(self):
+        FakeConnection.script = [FakeResponse(503), FakeResponse(200, b"ok")]
+        self.assertEqual(self.client.request("GET", "https://host/x"), b"ok")
+
+        FakeConnection.script = [FakeResponse(503)]
+        with self.assertRaises(news_bot.HttpError) as raised:
+            self.client.request("POST", "https://host/x", body=b"{}")
+        self.assertEqual(raised.exception.status, 503)
+        self.assertEqual(FakeConnection.script, [])
+
+    def test_retries_are_limited(self):
+        FakeConnection.script = [FakeResponse(503)] * (self.client.retries + 1)
+        with self.assertRaises(news_bot.HttpError):
+            self.client.request("GET", "https://host/x")
+        self.assertEqual(FakeConnection.script, [])
+
+    def test_4xx_is_not_retried(self):
+        FakeConnection.script = [FakeResponse(400, b'{"ok":false}')]
+        with self.assertRaises(news_bot.HttpError) as raised:
+            self.client.request("GET", "https://host/x")
+        self.assertEqual(raised.exception.body, b'{"ok":false}')
+
+    def test_new_connection_post_is_never_replayed(self):
+        FakeConnection.script = [ConnectionResetError(), FakeResponse(200, b"ok")]
+        with self.assertRaises(ConnectionResetError):
+            self.client.request("POST", "https://host/x", body=b"{}")
+        self.assertEqual(len(FakeConnection.created), 1)
+
+    def test_new_connection_get_is_retried(self):
+        FakeConnection.script = [ConnectionResetError(), FakeResponse(200, b"ok")]
+        self.assertEqual(self.client.request("GET", "https://host/x"), b"ok")
+        self.assertEqual(len(FakeConnection.created), 2)
+
+    def test_pooled_post_reconnects_after_server_close(self):
+        # Сервер закрыл простаивавшее соединение до запроса - POST до него не дошел
+        self.pooled()
+        FakeConnection.script = [news_bot.http.client.RemoteDisconnected(), FakeResponse(200, b"ok")]
+        self.assertEqual(self.client.request("POST", "https://host/x", body=b"{}"), b"ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
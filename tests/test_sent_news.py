@@ -0,0 +1,69 @@
+import os
+import random
+import tempfile
+import unittest
+
+from helpers import news_bot
+
+VOCABULARY = [f"w{i}" for i in range(40)]
+
+
+class TitleIndexTest(unittest.TestCase):
+    """Поиск похожих заголовков по индексу должен совпадать с полным перебором"""
+
+    def tracker(self, similarity):
+        directory = tempfile.mkdtemp()
+        tracker = news_bot.SentNewsTracker(
+            os.path.join(directory, "sent_news.sqlite"), os.path.join(directory, "sent_news.json")
+        )
+        self.addCleanup(tracker.close)
+        # Префикс-фильтр зависит от порога, поэтому он задается до заполнения индекса
+        tracker.TITLE_SIMILARITY = similarity
+        return tracker
+
+    def brute_force(self, tracker, title):
+        words = tracker._tokenize(title)
+        return any(
+            words and entry.tokens and tracker._similarity(words, entry.tokens) > tracker.TITLE_SIMILARITY
+            for entry in tracker.recent_news.values()
+        )
+
+    def mutate(self, rng, title):
+        """Заголовок, отличающийся от title на пару слов: такие пары лежат около порога"""
+        words = title.split()
+        for _ in range(rng.randint(0, 2)):
+            action = rng.random()
+            if action < 0.4 and len(words) > 1:
+                words.pop(rng.randrange(len(words)))
+            elif action < 0.7:
+                words.insert(rng.randrange(len(words) + 1), rng.choice(VOCABULARY))
+            else:
+                words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+        return " ".join(words)
+
+    def test_index_matches_brute_force(self):
+        rng = random.Random(1234)
+        for similarity in (news_bot.SentNewsTracker.TITLE_SIMILARITY, 0.7, 0.5):
+            with self.subTest(similarity=similarity):
+                tracker = self.tracker(similarity)
+                titles = [
+                    " ".join(rng.sample(VOCABULARY, rng.randint(1, 14)))
+                    for _ in range(400)
+                ]
+                tracker.mark_many_as_sent([(f"https://sent/{i}", title) for i, title in enumerate(titles)])
+
+                mismatches = []
+                for i in range(2000):
+                    if rng.random() < 0.8:
+                        query = self.mutate(rng, rng.choice(titles))
+                    else:
+                        query = " ".join(rng.sample(VOCABULARY, rng.randint(1, 14)))
+                    # URL новый, так что дубль возможен только по заголовку
+                    found = tracker.is_duplicate(f"https://new/{i}", query)
+                    if found != self.brute_force(tracker, query):
+                        mismatches.append(query)
+                self.assertEqual(mismatches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
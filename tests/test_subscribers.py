@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from helpers import news_bot
+
+
+class SubscriberLogTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, "subscribers.json")
+        self.log_filename = os.path.join(self.dir, "subscribers.log")
+
+    def manager(self):
+        return news_bot.SubscriberManager(self.filename, self.log_filename)
+
+    def test_replay_log_over_snapshot(self):
+        manager = self.manager()
+        manager.add_subscriber("1")
+        manager.add_subscriber("2")
+        manager.remove_subscriber("1")
+        self.assertEqual(self.manager().subscribers, {"2"})
+
+    def test_torn_last_line_is_skipped(self):
+        with open(self.log_filename, "wb") as f:
+            f.write(b"+1\n+2\n-1\n+3")
+        manager = self.manager()
+        self.assertEqual(manager.subscribers, {"2"})
+        # Обрывок удален из журнала и не склеивается со следующей записью
+        manager.add_subscriber("4")
+        with open(self.log_filename, "rb") as f:
+            self.assertEqual(f.read(), b"+1\n+2\n-1\n+4\n")
+        self.assertEqual(self.manager().subscribers, {"2", "4"})
+
+    def test_broken_line_is_skipped(self):
+        with open(self.log_filename, "wb") as f:
+            f.write(b"+1\n\xff\xfe\n?2\n+3\n")
+        self.assertEqual(self.manager().subscribers, {"1", "3"})
+
+    def test_compaction_replaces_log(self):
+        manager = self.manager()
+        manager.add_subscriber("1")
+        manager.add_subscriber("2")
+        manager.flush()
+        self.assertEqual(os.path.getsize(self.log_filename), 0)
+        manager.remove_subscriber("2")
+        self.assertEqual(self.manager().subscribers, {"1"})
+
+    def test_crash_before_log_replace_keeps_changes(self):
+        manager = self.manager()
+        manager.add_subscriber("1")
+        manager.remove_subscriber("1")
+        manager.add_subscriber("2")
+        # Снимок записан, а журнал подменить не успели: старый журнал применяется повторно
+        news_bot.write_json_atomic(self.filename, {"subscribers": ["2"]})
+        self.assertEqual(self.manager().subscribers, {"2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
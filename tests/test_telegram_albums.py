@@ -0,0 +1,94 @@
+import json
+import threading
+import unittest
+
+from helpers import news_bot
+
+CHATS = ("c0", "c1", "c2", "c3")
+
+
+class FakeSubscribers:
+    def get_subscribers(self):
+        return frozenset(CHATS)
+
+
+class FakeTracker:
+    def is_sent(self, url):
+        return False
+
+    def mark_many_as_sent(self, items):
+        pass
+
+
+def telegram_error(status, description):
+    body = json.dumps({"ok": False, "error_code": status, "description": description}).encode()
+    return news_bot.HttpError(status, "error", body)
+
+
+class AlbumBroadcastTest(unittest.TestCase):
+    def broadcast(self, album_error):
+        """
+        Разослать две статьи с картинками; album_error(chat_id, media) возвращает
+        исключение для отправки альбома или None, если Telegram его принял
+        """
+        bot = news_bot.TelegramBot("token", FakeSubscribers())
+        calls = []
+        lock = threading.Lock()
+
+        def post(chat_id, payload, method="sendMessage", tokens=1):
+            data = json.loads(payload)
+            media = [item["media"] for item in data.get("media", [])]
+            with lock:
+                calls.append((chat_id, method, media))
+            if method == "sendMediaGroup":
+                error = album_error(chat_id, media)
+                if error is not None:
+                    raise error
+                return json.dumps({"ok": True, "result": [
+                    {"message_id": 1, "photo": [{"file_id": "small"}, {"file_id": "id-" + url}]}
+                    for url in media
+                ]}).encode()
+            return b'{"ok":true,"result":{}}'
+
+        bot._post = post
+        articles = [
+            {"title": f"t{i}", "url": f"https://news/{i}", "image": f"https://img/{i}", "theme": "T"}
+            for i in range(2)
+        ]
+        bot.broadcast_articles(articles, FakeTracker())
+        return calls
+
+    def albums(self, calls):
+        return [(chat_id, media) for chat_id, method, media in calls if method == "sendMediaGroup"]
+
+    def test_rejected_images_fail_album_for_everyone(self):
+        calls = self.broadcast(
+            lambda chat_id, media: telegram_error(400, "Bad Request: wrong type of the web page content")
+        )
+        # Непринятый альбом отправляется один раз, остальные чаты сразу получают текст
+        self.assertEqual(len(self.albums(calls)), 1)
+        for chat_id in CHATS:
+            # Заголовок, текст вместо альбома и итоговое сообщение
+            self.assertEqual(sum(1 for c, method, _ in calls if c == chat_id and method == "sendMessage"), 3)
+
+    def test_chat_error_does_not_fail_album(self):
+        errors = {
+            "forbidden": telegram_error(403, "Forbidden: bot was blocked by the user"),
+            "rights": telegram_error(400, "Bad Request: not enough rights to send photos to the chat"),
+            "not found": telegram_error(400, "Bad Request: chat not found"),
+        }
+        for name, error in errors.items():
+            with self.subTest(name):
+                calls = self.broadcast(lambda chat_id, media: error if chat_id == "c0" else None)
+                albums = self.albums(calls)
+                others = [chat_id for chat_id, _ in albums if chat_id != "c0"]
+                self.assertEqual(sorted(others), ["c1", "c2", "c3"])
+                # Картинки по URL загружаются один раз, дальше альбом уходит по file_id
+                uploaded = [chat_id for chat_id, media in albums if chat_id != "c0" and media[0].startswith("https://")]
+                reused = [chat_id for chat_id, media in albums if chat_id != "c0" and media[0].startswith("id-")]
+                self.assertEqual(len(uploaded), 1)
+                self.assertEqual(len(reused), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
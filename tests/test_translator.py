@@ -0,0 +1,123 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from helpers import news_bot
+
+
+class TranslatorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache_file = os.path.join(tempfile.mkdtemp(), "translate_cache.sqlite")
+        self.translator = self.open_translator()
+
+    def open_translator(self):
+        translator = news_bot.Translator(self.cache_file)
+        self.addCleanup(translator.close)
+        return translator
+
+    def age(self, translator, key, days):
+        """Состарить перевод в кэше (в памяти и на диске) на days дней"""
+        created_at = time.time() - days * 86400
+        with translator._lock:
+            if key in translator._mem:
+                translator._mem[key] = (translator._mem[key][0], created_at)
+            translator._db.execute("UPDATE tr SET created_at=? WHERE k=?", (created_at, key))
+
+
+class CacheTtlTest(TranslatorTestCase):
+    def test_expired_memory_entry_is_not_returned(self):
+        key = self.translator._cache_key("hello", "en")
+        self.translator._cache_put_many([(key, "привіт")])
+        self.assertEqual(self.translator._cache_get(key), "привіт")
+        self.age(self.translator, key, self.translator.CACHE_TTL_DAYS + 1)
+        self.assertIsNone(self.translator._cache_get(key))
+
+    def test_cleanup_drops_expired_memory_entries(self):
+        old = self.translator._cache_key("old", "en")
+        new = self.translator._cache_key("new", "en")
+        self.translator._cache_put_many([(old, "старий")])
+        self.translator._cache_put_many([(new, "новий")])
+        self.age(self.translator, old, self.translator.CACHE_TTL_DAYS + 1)
+        self.translator.cleanup_cache()
+        self.assertNotIn(old, self.translator._mem)
+        self.assertIn(new, self.translator._mem)
+
+    def test_warmed_entries_keep_their_age(self):
+        key = self.translator._cache_key("hello", "en")
+        self.translator._cache_put_many([(key, "привіт")])
+        self.age(self.translator, key, self.translator.CACHE_TTL_DAYS - 1)
+        created_at = self.translator._mem[key][1]
+
+        warmed = self.open_translator()
+        self.assertEqual(warmed._mem[key], ("привіт", created_at))
+        # Через 2 дня перевод устареет и в памяти, как и на диске
+        with mock.patch.object(news_bot.time, "time", return_value=time.time() + 2 * 86400):
+            self.assertIsNone(warmed._cache_get(key))
+
+
+class SingleTextTest(TranslatorTestCase):
+    def test_translate_to_ukrainian_uses_batch_path(self):
+        requests = []
+
+        def request(text, source_lang):
+            requests.append(text)
+            return "привіт"
+
+        self.translator._request_translation = request
+        self.assertEqual(self.translator.translate_to_ukrainian("hello", "en"), "привіт")
+        # Повторный перевод берется из общего кэша
+        self.assertEqual(self.translator.translate_to_ukrainian("hello", "en"), "привіт")
+        self.assertEqual(requests, ["hello"])
+        self.assertEqual(self.translator.translate_to_ukrainian("привіт", "uk"), "привіт")
+        self.assertEqual(self.translator.translate_to_ukrainian("N/A", "en"), "N/A")
+
+
+class BatchSplitTest(TranslatorTestCase):
+    def fake_google(self, merged=(), failing=()):
+        """
+        Перевод построчно; строку из merged Google склеивает с соседней,
+        а запрос с текстом из failing не выполняется. Возвращает список запросов
+        """
+        requests = []
+
+        def request(text, source_lang):
+            lines = text.split("\n")
+            requests.append(lines)
+            if any(line in failing for line in lines):
+                return None
+            out = ["uk:" + line for line in lines]
+            for i, line in enumerate(lines):
+                if line in merged and len(out) > 1:
+                    j = i if i + 1 < len(out) else i - 1
+                    out[j:j + 2] = [out[j] + " " + out[j + 1]]
+                    break
+            return "\n".join(out)
+
+        self.translator._request_translation = request
+        return requests
+
+    def test_matching_batch_is_one_request(self):
+        requests = self.fake_google()
+        texts = [f"t{i}" for i in range(8)]
+        self.assertEqual(self.translator._translate_batch(texts, "en"), [f"uk:t{i}" for i in range(8)])
+        self.assertEqual(len(requests), 1)
+
+    def test_mismatch_is_bisected_down_to_the_bad_text(self):
+        requests = self.fake_google(merged={"t5"})
+        texts = [f"t{i}" for i in range(8)]
+        result = self.translator._translate_batch(texts, "en")
+        self.assertEqual(result, [f"uk:t{i}" for i in range(8)])
+        # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1: лишних запросов O(log n), а не по одному на текст
+        self.assertEqual([len(lines) for lines in requests], [8, 4, 4, 2, 1, 1, 2])
+
+    def test_failed_request_leaves_texts_untranslated(self):
+        self.fake_google(failing={"t2"})
+        self.assertEqual(self.translator._translate_batch(["t1", "t2", "t3"], "en"), [None, None, None])
+        results = self.translator.translate_many(["t1", "t2", "t3"], "en")
+        self.assertEqual(results, ["t1", "t2", "t3"])
+
+
+if __name__ == "__main__":
+    unittest.main()